@@ -14,16 +14,25 @@ from .settings import DOCKER_TEST_IMAGE
 ERROR = 1
 WARNING = 0
 
+MAX_CONCURRENT_CHECKS = 8
+
 
 class Check:
     name = None
     command = None
     error_level = ERROR
 
+    # seconds until a hanging command is considered failed
+    timeout = 120
+
     def run_check(self):
         errors = []
         try:
-            utils.check_call(self.command, catch=False, silent=True)
+            utils.check_call(
+                self.command, catch=False, silent=True, timeout=self.timeout
+            )
+        except subprocess.TimeoutExpired as exc:
+            errors.append(self.fmt_timeout(exc))
         except OSError as exc:
             if exc.errno == errno.ENOENT:
                 errors.append(f"Executable {self.command[0]} not found")
@@ -42,6 +51,10 @@ class Check:
     def fmt_command(self):
         return " ".join(self.command)
 
+    def fmt_timeout(self, exc):
+        command = " ".join(exc.cmd)
+        return f"Command '{command}' timed out after {exc.timeout} seconds"
+
     def fmt_exception(self, exc):
         command_output = exc.output
 
@@ -86,12 +99,22 @@ class DockerComposeCheck(Check):
         errors = []
         try:
             try:
-                utils.check_call(self.command, catch=False, silent=True)
+                utils.check_call(
+                    self.command,
+                    catch=False,
+                    silent=True,
+                    timeout=self.timeout,
+                )
             except (OSError, subprocess.CalledProcessError):
                 # Check for the old version
                 utils.check_call(
-                    ("docker-compose", "--version"), catch=False, silent=True
+                    ("docker-compose", "--version"),
+                    catch=False,
+                    silent=True,
+                    timeout=self.timeout,
                 )
+        except subprocess.TimeoutExpired as exc:
+            errors.append(self.fmt_timeout(exc))
         except OSError as exc:
             if exc.errno == errno.ENOENT:
                 errors.append(
@@ -225,14 +248,31 @@ def check_requirements(config=None, checks=None):
 
     skip_doctor_checks = config.get_skip_doctor_checks() if config else []
 
+    selected_checks = []
     for check_key in checks:
         if check_key in skip_doctor_checks:
             continue
         check = ALL_CHECKS.get(check_key)
         if not check:
             raise DivioException(f"Invalid check {check_key}")
-        errors = check().run_check()
-        yield check_key, check.name, errors
+        selected_checks.append((check_key, check))
+
+    if not selected_checks:
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run_check(selected_check):
+        check_key, check = selected_check
+        return check_key, check.name, check().run_check()
+
+    # the checks are independent of each other and mostly wait for
+    # subprocesses or the network, so they run concurrently. The results
+    # are still yielded in the order of the checks.
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_CONCURRENT_CHECKS, len(selected_checks)),
+    ) as executor:
+        yield from executor.map(run_check, selected_checks)
 
 
 def get_prefix(success):
@@ -1,16 +1,15 @@
 import functools
-import json
+import io
 import logging
 import os
 import sys
 import time
 from functools import partial
+from operator import itemgetter
 
 import click
-import sentry_sdk
 import simple_logging_setup
 from click_aliases import ClickAliasedGroup
-from sentry_sdk.integrations.atexit import AtexitIntegration
 
 import divio_cli
 from divio_cli import widgets
@@ -20,7 +19,7 @@ from divio_cli.domain_models.app_template import AppTemplate
 from . import localdev, messages, settings
 from .check_system import check_requirements, check_requirements_human
 from .cloud import CloudClient, get_divio_zone, get_endpoint
-from .excepthook import DivioExcepthookIntegration, divio_shutdown
+from .config import UPDATE_CHECK_JOIN_TIMEOUT, Config
 from .exceptions import (
     ConfigurationNotFound,
     DivioException,
@@ -33,33 +32,64 @@ from .localdev.utils import (
     get_project_settings,
     migrate_project_settings,
 )
-from .upload.addon import upload_addon
 from .utils import (
-    Map,
+    ENVIRONMENT_TITLE,
+    ContextObject,
     clean_table_cell,
     download_file,
     echo_environment_variables_as_txt,
     echo_large_content,
+    echo_large_json,
     get_cp_url,
+    get_executable_dir,
     get_git_checked_branch,
+    get_local_version_json,
     hr,
+    json_dumps,
     launch_url,
     open_application_cloud_site,
     table,
+    table_many,
 )
-from .validators.addon import validate_addon
-from .wizards import CreateAppWizard
-
-
-try:
-    import ipdb as pdb  # noqa: T100
-except ImportError:
-    import pdb  # noqa: T100
 
 
 # Display the default value for options globally.
 click.option = partial(click.option, show_default=True)
 
+# Deployments and environment variables in table format display less
+# content than in json format. Here are the desired columns to be displayed.
+DEPLOYMENTS_TABLE_COLUMNS = (
+    "uuid",
+    "started_at",
+    "ended_at",
+    "status",
+    "success",
+)
+ENVIRONMENT_VARIABLES_TABLE_COLUMNS = ("name", "value", "is_sensitive")
+
+# Options shared by several commands.
+PAGER_OPTION = click.option(
+    "-p/-P",
+    "--pager/--no-pager",
+    default=False,
+    is_flag=True,
+    help="Choose whether to display content via pager.",
+)
+JSON_OPTION = click.option(
+    "--json",
+    "as_json",
+    is_flag=True,
+    default=False,
+    help="Choose whether to display content in json format.",
+)
+LIMIT_RESULTS_OPTION = click.option(
+    "--limit",
+    "--limit-results",
+    "limit_results",
+    type=int,
+    help="The maximum number of results that can be retrieved.",
+)
+
 
 def set_cli_non_interactive(ctx, non_interactive, value):
     if value:
@@ -163,13 +193,30 @@ def cli(ctx, debug, zone, sudo, verbose):
     if zone:
         os.environ["DIVIO_ZONE"] = zone
 
-    ctx.obj = Map()
-    ctx.obj.client = CloudClient(
-        get_endpoint(zone=zone), debug=debug, sudo=sudo
-    )
+    try:
+        command = sys.argv[1]
+    except IndexError:
+        command = None
+
+    # 'divio version' only prints local information, so neither error
+    # reporting nor the cloud client is needed
+    is_version_command = command == "version"
+
+    config = Config()
+
+    def get_client():
+        return CloudClient(
+            get_endpoint(zone=zone), debug=debug, sudo=sudo, config=config
+        )
+
+    ctx.obj = ContextObject(client_factory=get_client, config=config)
     ctx.obj.zone = zone
 
     if debug:
+        try:
+            import ipdb as pdb  # noqa: T100
+        except ImportError:
+            import pdb  # noqa: T100
 
         def exception_handler(type, value, traceback):
             click.secho(
@@ -193,9 +240,15 @@ def cli(ctx, debug, zone, sudo, verbose):
             pdb.post_mortem(traceback)
 
         sys.excepthook = exception_handler
-    else:
+    elif not is_version_command:
+        # sentry is only imported when it is used as it is expensive to import
+        import sentry_sdk
+        from sentry_sdk.integrations.atexit import AtexitIntegration
+
+        from .excepthook import DivioExcepthookIntegration, divio_shutdown
+
         sentry_sdk.init(
-            ctx.obj.client.config.get_sentry_dsn(),
+            config.get_sentry_dsn(),
             traces_sample_rate=0,
             release=divio_cli.__version__,
             server_name="client",
@@ -205,18 +258,17 @@ def cli(ctx, debug, zone, sudo, verbose):
             ],
         )
 
-    try:
-        is_version_command = sys.argv[1] == "version"
-    except IndexError:
-        is_version_command = False
-
     # migrate project_settings if needed
-    migrate_project_settings(client=ctx.obj.client)
+    migrate_project_settings(get_client=lambda: ctx.obj.client)
 
     # skip if 'divio version' is run
-    if not is_version_command:
-        # check for newer versions
-        update_info = ctx.obj.client.config.check_for_updates()
+    if not is_version_command and not config.is_update_check_disabled():
+        # check for newer versions in the background, so PyPI never blocks
+        # the actual command. The notice below uses the last known result.
+        if config.is_update_check_due():
+            config.check_for_updates_in_background()
+
+        update_info = config.get_update_info()
         if update_info["update_available"]:
             click.secho(
                 "New version {} is available. Type `divio version` to "
@@ -305,20 +357,8 @@ def services():
     required=True,
     help="The UUID of the region to list services for.",
 )
-@click.option(
-    "--json",
-    "as_json",
-    is_flag=True,
-    default=False,
-    help="Choose whether to display content in json format.",
-)
-@click.option(
-    "--limit",
-    "--limit-results",
-    "limit_results",
-    type=int,
-    help="The maximum number of results that can be retrieved.",
-)
+@JSON_OPTION
+@LIMIT_RESULTS_OPTION
 @click.pass_obj
 def list_services(obj, region, as_json, limit_results):
     """List all available services for a region."""
@@ -337,7 +377,7 @@ def list_services(obj, region, as_json, limit_results):
             click.secho(msg, fg="yellow")
 
     if as_json:
-        click.echo(json.dumps(results, indent=2, sort_keys=True))
+        echo_large_json(results, ctx=obj, indent=2, sort_keys=True)
         return
 
     headers = ["UUID", "Name", "Type", "Description"]
@@ -418,13 +458,7 @@ def app():
     default=False,
     help="Deploy the application after creation. (test environment)",
 )
-@click.option(
-    "--json",
-    "as_json",
-    is_flag=True,
-    default=False,
-    help="Choose whether to display content in json format.",
-)
+@JSON_OPTION
 @click.pass_obj
 def application_create(
     obj,
@@ -440,6 +474,7 @@ def application_create(
     as_json,
 ):
     """Create a new application."""
+    from .wizards import CreateAppWizard
 
     obj.interactive = interactive
     obj.verbose = verbose
@@ -497,20 +532,8 @@ def application_create(
     default=False,
     help="Group by organisation.",
 )
-@click.option(
-    "-p/-P",
-    "--pager/--no-pager",
-    default=False,
-    is_flag=True,
-    help="Choose whether to display content via pager.",
-)
-@click.option(
-    "--json",
-    "as_json",
-    is_flag=True,
-    default=False,
-    help="Choose whether to display content in json format.",
-)
+@PAGER_OPTION
+@JSON_OPTION
 @click.pass_obj
 def application_list(obj, grouped, pager, as_json):
     """List all your applications."""
@@ -518,39 +541,52 @@ def application_list(obj, grouped, pager, as_json):
     api_response = obj.client.get_applications_v1()
 
     if as_json:
-        click.echo(json.dumps(api_response, indent=2, sort_keys=True))
+        echo_large_json(api_response, ctx=obj, indent=2, sort_keys=True)
         return
 
     header = ["ID", "Slug", "Name", "Organisation"]
 
+    # applications are sorted by their UUID, which the API always returns
+    # in canonical lowercase form
+    sort_key = itemgetter(0)
+
+    # all organisation names are fetched with a single listing instead of
+    # one request per organisation. Organisations missing from it are
+    # still looked up individually.
+    organisation_names = {}
+    if api_response["results"]:
+        organisations, _ = obj.client.get_organisations()
+        organisation_names = {
+            organisation["uuid"]: organisation["name"]
+            for organisation in organisations
+        }
+
+    # group applications by organisation in a single pass
     data = {}
     for application in api_response["results"]:
-        org_name = obj.client.get_organisation(application["organisation"])[
-            "name"
-        ]
-        if not data.get(org_name):
-            data[org_name] = []
-        data[org_name].append(
+        organisation_uuid = application["organisation"]
+        if organisation_uuid not in organisation_names:
+            organisation = obj.client.get_organisation(organisation_uuid)
+            organisation_names[organisation_uuid] = organisation["name"]
+        data.setdefault(organisation_names[organisation_uuid], []).append(
             (application["uuid"], application["slug"], application["name"])
         )
 
-    def sort_applications(items):
-        return sorted(items, key=lambda x: x[0].lower())
-
     # print via pager
     if grouped:
-        output_items = []
+        output = io.StringIO()
         for organisation in data:
-            output_items.append(
-                "{title}\n{line}\n\n{table}\n\n".format(
+            output.write(
+                "{title}\n{line}\n\n{table}\n\n{linesep}".format(
                     title=organisation,
                     line="=" * len(organisation),
                     table=table(
-                        sort_applications(data[organisation]), header[:3]
+                        sorted(data[organisation], key=sort_key), header[:3]
                     ),
+                    linesep=os.linesep,
                 )
             )
-        output = os.linesep.join(output_items).rstrip(os.linesep)
+        output = output.getvalue().rstrip(os.linesep)
     else:
         # add org name to all applications
         applications = [
@@ -558,7 +594,7 @@ def application_list(obj, grouped, pager, as_json):
             for organisation in data
             for each in data[organisation]
         ]
-        output = table(sort_applications(applications), header)
+        output = table(sorted(applications, key=sort_key), header)
 
     echo_large_content(output, ctx=obj)
 
@@ -691,20 +727,8 @@ def application_update(obj, strict):
 
 # Deployments group.
 @app.group()
-@click.option(
-    "-p/-P",
-    "--pager/--no-pager",
-    default=False,
-    is_flag=True,
-    help="Choose whether to display content via pager.",
-)
-@click.option(
-    "--json",
-    "as_json",
-    is_flag=True,
-    default=False,
-    help="Choose whether to display content in json format.",
-)
+@PAGER_OPTION
+@JSON_OPTION
 @click.pass_obj
 def deployments(obj, pager, as_json):
     """Retrieve deployments."""
@@ -712,16 +736,6 @@ def deployments(obj, pager, as_json):
     obj.pager = pager
     obj.as_json = as_json
 
-    # Deployments in table format display less content than in
-    # json format. Here are the desired columns to be displayed.
-    obj.table_format_columns = [
-        "uuid",
-        "started_at",
-        "ended_at",
-        "status",
-        "success",
-    ]
-
 
 @deployments.command(name="list")
 @click.option(
@@ -742,13 +756,7 @@ def deployments(obj, pager, as_json):
     is_flag=True,
     help="Retrieve deployments from all available environments.",
 )
-@click.option(
-    "--limit",
-    "--limit-results",
-    "limit_results",
-    type=int,
-    help="The maximum number of results that can be retrieved.",
-)
+@LIMIT_RESULTS_OPTION
 @click.pass_obj
 @allow_remote_id_override
 def list_deployments(
@@ -766,19 +774,19 @@ def list_deployments(
     )
 
     if obj.as_json:
-        json_content = json.dumps(results, indent=2)
-        echo_large_content(json_content, ctx=obj)
+        echo_large_json(results, ctx=obj, indent=2)
     else:
-        content = ""
-        for result in results:
-            content_table_title = f"Environment: {result['environment']} ({result['environment_uuid']})"
-            columns = obj.table_format_columns
-            rows = [
-                [row[key] for key in columns] for row in result["deployments"]
-            ]
-            content_table = table(rows, columns, tablefmt="grid")
-            content += f"{content_table_title}\n{content_table}\n\n"
-        echo_large_content(content.strip("\n"), ctx=obj)
+        columns = DEPLOYMENTS_TABLE_COLUMNS
+        get_columns = itemgetter(*columns)
+        tables = (
+            (
+                ENVIRONMENT_TITLE.format_map(result),
+                [get_columns(row) for row in result["deployments"]],
+            )
+            for result in results
+        )
+        content = table_many(tables, columns, tablefmt="grid")
+        echo_large_content(content, ctx=obj)
 
     if messages:
         click.echo()
@@ -798,15 +806,14 @@ def get_deployment(obj, remote_id, deployment_uuid):
     response = obj.client.get_deployment(remote_id, deployment_uuid)
     deployment = response["deployment"]
     if obj.as_json:
-        json_content = json.dumps([response], indent=2)
-        echo_large_content(json_content, ctx=obj)
+        echo_large_json([response], ctx=obj, indent=2)
     else:
-        content_table_title = f"Environment: {response['environment']} ({response['environment_uuid']})"
+        content_table_title = ENVIRONMENT_TITLE.format_map(response)
         deployment["environment_variables"] = ", ".join(
             deployment["environment_variables"]
         )
         # Flipped table.
-        columns = [*obj.table_format_columns, "environment_variables"]
+        columns = [*DEPLOYMENTS_TABLE_COLUMNS, "environment_variables"]
         rows = [[key, deployment[key] or ""] for key in columns]
         content_table = table(
             rows, headers=(), tablefmt="grid", maxcolwidths=50
@@ -840,10 +847,9 @@ def get_deployment_environment_variable(
         "environment_uuid": response["environment_uuid"],
     }
     if obj.as_json:
-        json_content = json.dumps([env_var], indent=2)
-        echo_large_content(json_content, ctx=obj)
+        echo_large_json([env_var], ctx=obj, indent=2)
     else:
-        content_table_title = f"Environment: {response['environment']} ({response['environment_uuid']})"
+        content_table_title = ENVIRONMENT_TITLE.format_map(response)
         columns = ["name", "value"]
         # Flipped table.
         rows = [[key, clean_table_cell(env_var, key)] for key in columns]
@@ -856,20 +862,8 @@ def get_deployment_environment_variable(
 
 # Environment variables group.
 @app.group(aliases=["env-vars"])
-@click.option(
-    "-p/-P",
-    "--pager/--no-pager",
-    default=False,
-    is_flag=True,
-    help="Choose whether to display content via pager.",
-)
-@click.option(
-    "--json",
-    "as_json",
-    is_flag=True,
-    default=False,
-    help="Choose whether to display content in json format.",
-)
+@PAGER_OPTION
+@JSON_OPTION
 @click.option(
     "--txt",
     "as_txt",
@@ -885,10 +879,6 @@ def environment_variables(obj, pager, as_json, as_txt):
     obj.as_json = as_json
     obj.as_txt = as_txt
 
-    # Environment variables in table format display less content than in
-    # json format. Here are the desired columns to be displayed.
-    obj.table_format_columns = ["name", "value", "is_sensitive"]
-
 
 @environment_variables.command("list")
 @click.option(
@@ -909,13 +899,7 @@ def environment_variables(obj, pager, as_json, as_txt):
     is_flag=True,
     help="Retrieve environment variables from all available environments.",
 )
-@click.option(
-    "--limit",
-    "--limit-results",
-    "limit_results",
-    type=int,
-    help="The maximum number of results that can be retrieved.",
-)
+@LIMIT_RESULTS_OPTION
 @click.pass_obj
 @allow_remote_id_override
 def list_environment_variables(
@@ -939,27 +923,25 @@ def list_environment_variables(
             env_var.pop("environment")
 
     if obj.as_json:
-        json_content = json.dumps(results, indent=2)
-        echo_large_content(json_content, ctx=obj)
+        echo_large_json(results, ctx=obj, indent=2)
     elif obj.as_txt:
         echo_environment_variables_as_txt(
             results, obj, all_environments, environment
         )
     else:
-        content = ""
-        for result in results:
-            content_table_title = f"Environment: {result['environment']} ({result['environment_uuid']})"
-            columns = obj.table_format_columns
-            rows = [
-                [clean_table_cell(row, key) for key in columns]
-                for row in result["environment_variables"]
-            ]
-            content_table = table(
-                rows, columns, tablefmt="grid", maxcolwidths=50
+        columns = ENVIRONMENT_VARIABLES_TABLE_COLUMNS
+        tables = (
+            (
+                ENVIRONMENT_TITLE.format_map(result),
+                [
+                    [clean_table_cell(row, key) for key in columns]
+                    for row in result["environment_variables"]
+                ],
             )
-            content += f"{content_table_title}\n{content_table}\n\n"
-
-        echo_large_content(content.strip("\n"), ctx=obj)
+            for result in results
+        )
+        content = table_many(tables, columns, tablefmt="grid", maxcolwidths=50)
+        echo_large_content(content, ctx=obj)
 
     if messages:
         click.echo()
@@ -986,13 +968,7 @@ def list_environment_variables(
     is_flag=True,
     help="Retrieve an environment variable across all environments.",
 )
-@click.option(
-    "--limit",
-    "--limit-results",
-    "limit_results",
-    type=int,
-    help="The maximum number of results that can be retrieved.",
-)
+@LIMIT_RESULTS_OPTION
 @click.argument("variable_name")
 @click.pass_obj
 @allow_remote_id_override
@@ -1014,26 +990,29 @@ def get_environment_variable(
 
     if results:
         if obj.as_json:
-            echo_large_content(json.dumps(results, indent=2), ctx=obj)
+            echo_large_json(results, ctx=obj, indent=2)
         elif obj.as_txt:
             echo_environment_variables_as_txt(
                 results, obj, all_environments, environment, variable_name
             )
         else:
-            content = ""
-            for result in results:
-                # Each environment will only include one environment variable
-                # because of the name filter applied previously in the request.
-                env_var = result["environment_variables"][0]
-                content_table_title = f"Environment: {result['environment']} ({result['environment_uuid']})"
-                columns = obj.table_format_columns
-                row = [[clean_table_cell(env_var, key) for key in columns]]
-
-                content_table = table(
-                    row, columns, tablefmt="grid", maxcolwidths=50
+            columns = ENVIRONMENT_VARIABLES_TABLE_COLUMNS
+            # Each environment will only include one environment variable
+            # because of the name filter applied previously in the request.
+            tables = (
+                (
+                    ENVIRONMENT_TITLE.format_map(result),
+                    [
+                        [clean_table_cell(row, key) for key in columns]
+                        for row in result["environment_variables"][:1]
+                    ],
                 )
-                content += f"{content_table_title}\n{content_table}\n\n"
-            echo_large_content(content.strip("\n"), ctx=obj)
+                for result in results
+            )
+            content = table_many(
+                tables, columns, tablefmt="grid", maxcolwidths=50
+            )
+            echo_large_content(content, ctx=obj)
     else:
         click.secho(
             f"Could not find an environment variable named {variable_name!r} in any of the available environments."
@@ -1088,7 +1067,7 @@ def app_status():
 def application_setup(obj, slug, environment, path, overwrite, skip_doctor):
     """Set up a development environment for a Divio application."""
     if not skip_doctor and not check_requirements_human(
-        config=obj.client.config, silent=True
+        config=obj.config, silent=True
     ):
         raise DivioException(
             "There was a problem while checking your system. Please run "
@@ -1107,20 +1086,8 @@ def service_instances():
 
 @service_instances.command(name="list")
 @click.argument("environment", default="test")
-@click.option(
-    "--json",
-    "as_json",
-    is_flag=True,
-    default=False,
-    help="Choose whether to display content in json format.",
-)
-@click.option(
-    "--limit",
-    "--limit-results",
-    "limit_results",
-    type=int,
-    help="The maximum number of results that can be retrieved.",
-)
+@JSON_OPTION
+@LIMIT_RESULTS_OPTION
 @click.pass_obj
 @allow_remote_id_override
 def list_service_instances(
@@ -1156,7 +1123,7 @@ def list_service_instances(
             click.secho(msg, fg="yellow")
 
     if as_json:
-        click.echo(json.dumps(results, indent=2, sort_keys=True))
+        echo_large_json(results, ctx=obj, indent=2, sort_keys=True)
         return
 
     headers = [
@@ -1565,6 +1532,8 @@ def addon(obj, path):
 @click.pass_context
 def addon_validate(ctx):
     """Validate addon configuration."""
+    from .validators.addon import validate_addon
+
     validate_addon(ctx.parent.params["path"])
     click.echo("Addon is valid!")
 
@@ -1573,6 +1542,8 @@ def addon_validate(ctx):
 @click.pass_context
 def addon_upload(ctx):
     """Upload addon to the Divio Control Panel."""
+    from .upload.addon import upload_addon
+
     click.echo(upload_addon(ctx.obj.client, ctx.parent.params["path"]))
 
 
@@ -1609,17 +1580,40 @@ def addon_register(ctx, package_name, verbose_name, organisation):
 @click.pass_obj
 def version(obj, skip_check, machine_readable):
     """Show version info."""
+    is_refreshing = False
+
+    if skip_check and machine_readable:
+        # the output only depends on the installation itself
+        click.echo(get_local_version_json())
+        return
+
     if skip_check:
         from . import __version__
 
         update_info = {"current": __version__}
     else:
-        update_info = obj.client.config.check_for_updates(force=True)
+        config = obj.config
+
+        # PyPI is only asked when the result of the last check is stale.
+        # A stale result is refreshed in the background, and only shown if
+        # the refresh doesn't finish within a short deadline. Only the very
+        # first check has to wait for PyPI.
+        if not config.has_update_check_result():
+            update_info = config.check_for_updates(force=True)
+        else:
+            if config.is_update_check_due():
+                thread = config.check_for_updates_in_background(force=True)
+                thread.join(timeout=UPDATE_CHECK_JOIN_TIMEOUT)
+                is_refreshing = thread.is_alive()
+            update_info = config.get_update_info()
 
-    update_info["location"] = os.path.dirname(os.path.realpath(sys.executable))
+    update_info["location"] = get_executable_dir()
 
     if machine_readable:
-        click.echo(json.dumps(update_info))
+        if update_info.get("pypi_error"):
+            # exceptions can't be serialized as json
+            update_info["pypi_error"] = str(update_info["pypi_error"])
+        click.echo(json_dumps(update_info))
     else:
         click.echo(
             "divio-cli {} from {}\n".format(
@@ -1647,6 +1641,11 @@ def version(obj, skip_check, machine_readable):
                     fg="red",
                     err=True,
                 )
+            elif is_refreshing:
+                click.echo(
+                    "No newer version of divio-cli was found by the last "
+                    "check. Checking again in the background."
+                )
             else:
                 click.echo("You have the latest version of divio-cli.")
 
@@ -1670,16 +1669,16 @@ def doctor(obj, machine_readable, checks):
         errors = {
             check: error
             for check, check_name, error in check_requirements(
-                obj.client.config, checks
+                obj.config, checks
             )
         }
         exitcode = 1 if any(errors.values()) else 0
-        click.echo(json.dumps(errors), nl=False)
+        click.echo(json_dumps(errors), nl=False)
     else:
         click.echo("Verifying your system setup...")
         exitcode = (
             ExitCode.SUCCESS
-            if check_requirements_human(obj.client.config, checks)
+            if check_requirements_human(obj.config, checks)
             else ExitCode.GENERIC_ERROR
         )
 
@@ -1692,20 +1691,8 @@ def organisations():
 
 
 @organisations.command(name="list")
-@click.option(
-    "--json",
-    "as_json",
-    is_flag=True,
-    default=False,
-    help="Choose whether to display content in json format.",
-)
-@click.option(
-    "--limit",
-    "--limit-results",
-    "limit_results",
-    type=int,
-    help="The maximum number of results that can be retrieved.",
-)
+@JSON_OPTION
+@LIMIT_RESULTS_OPTION
 @click.pass_obj
 def list_organisations(obj, as_json, limit_results):
     "List your organisations"
@@ -1722,7 +1709,7 @@ def list_organisations(obj, as_json, limit_results):
             click.secho(msg, fg="yellow")
 
     if as_json:
-        click.echo(json.dumps(results, indent=2, sort_keys=True))
+        echo_large_json(results, ctx=obj, indent=2, sort_keys=True)
         return
 
     headers = [
@@ -1749,20 +1736,8 @@ def regions():
 
 
 @regions.command(name="list")
-@click.option(
-    "--json",
-    "as_json",
-    is_flag=True,
-    default=False,
-    help="Choose whether to display content in json format.",
-)
-@click.option(
-    "--limit",
-    "--limit-results",
-    "limit_results",
-    type=int,
-    help="The maximum number of results that can be retrieved.",
-)
+@JSON_OPTION
+@LIMIT_RESULTS_OPTION
 @click.pass_obj
 def list_regions(obj, as_json, limit_results):
     """List all available regions"""
@@ -1779,7 +1754,7 @@ def list_regions(obj, as_json, limit_results):
             click.secho(msg, fg="yellow")
 
     if as_json:
-        click.echo(json.dumps(results, indent=2, sort_keys=True))
+        echo_large_json(results, ctx=obj, indent=2, sort_keys=True)
         return
 
     headers = [
@@ -1804,13 +1779,7 @@ def app_template():
 
 
 @app_template.command(name="list")
-@click.option(
-    "--json",
-    "as_json",
-    is_flag=True,
-    default=False,
-    help="Choose whether to display content in json format.",
-)
+@JSON_OPTION
 @click.pass_obj
 def app_template_list(obj, as_json):
     """List all app templates"""
@@ -1818,13 +1787,13 @@ def app_template_list(obj, as_json):
     client = obj.client2
     client.authenticate()
 
-    app_templates = AppTemplate.list(client=client)
+    app_templates = AppTemplate.list_all(client=client)
 
     # json view
     if as_json:
         data = [t.data for t in app_templates]
 
-        widgets.print_info(json.dumps(data))
+        widgets.print_info(json_dumps(data))
 
         return
 
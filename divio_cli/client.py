@@ -1,3 +1,4 @@
+import functools
 import json
 import logging
 import os
@@ -6,16 +7,30 @@ import textwrap
 from urllib.parse import urljoin
 
 from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from divio_cli.config import WritableNetRC
 from divio_cli.exceptions import DivioException
 from divio_cli.settings import ACCESS_TOKEN_URL_PATH
 
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
 DEFAULT_ZONE = "divio.com"
 
 GET_CURRENT_USER_URL_PATH = "/iam/v3/me/"
 
+# the connection pool has to be big enough to serve all threads that share
+# the session, otherwise connections get discarded instead of kept alive
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 64
+HTTP_MAX_RETRIES = 3
+
 logger = logging.getLogger("divio.client")
 http_request_logger = logging.getLogger("divio.client.http.request")
 http_response_logger = logging.getLogger("divio.client.http.response")
@@ -60,7 +75,7 @@ class Client:
     def get_control_panel_url(self, path, **query):
         return urljoin(f"https://{self.get_control_panel_host()}", path)
 
-    def request(self, method, path, *args, **kwargs):
+    def request(self, method, path, *args, headers=None, **kwargs):
         url = self.get_api_url(path=path)
 
         http_request_logger.debug("%s %s", method, url)
@@ -68,7 +83,7 @@ class Client:
         response = self.session.request(
             method=method,
             url=url,
-            headers=self.headers,
+            headers={**self.headers, **(headers or {})},
             *args,  # NOQA: B026
             **kwargs,
         )
@@ -81,34 +96,87 @@ class Client:
             response.headers.get("content-length", "[NOTSET]"),
         )
 
-        try:
-            text = response.json()
+        # decoding and pretty printing the body is expensive, so it is only
+        # done when somebody is going to read it
+        if http_response_body_logger.isEnabledFor(logging.DEBUG):
+            try:
+                text = response.json()
+
+            except json.JSONDecodeError:
+                text = response.text
+
+            http_response_body_logger.debug(
+                "url=%s \n%s",
+                response.url,
+                textwrap.indent(
+                    text=pprint.pformat(text),
+                    prefix="    ",
+                ),
+            )
+
+        # 304 Not Modified is only returned for conditional requests
+        if response.status_code not in (200, 304):
+            raise ApiError(status_code=response.status_code)
 
-        except json.JSONDecodeError:
-            text = response.text
+        return response
 
-        http_response_body_logger.debug(
-            "url=%s \n%s",
-            response.url,
-            textwrap.indent(
-                text=pprint.pformat(text),
-                prefix="    ",
-            ),
-        )
+    def _decode_json(self, response):
+        try:
+            if orjson:
+                return orjson.loads(response.content)
 
-        if response.status_code != 200:
-            raise ApiError(status_code=response.status_code)
+            return response.json()
 
-        return response
+        except ValueError as exception:
+            # both json.JSONDecodeError and orjson.JSONDecodeError are
+            # subclasses of ValueError
+            raise RuntimeError("invalid response") from exception
 
     def get_json(self, *args, **kwargs):
         response = self.request(*args, **kwargs)
 
-        try:
-            return response.json()
+        return self._decode_json(response)
 
-        except json.JSONDecodeError as exception:
-            raise RuntimeError("invalid response") from exception
+    def get_json_with_etag(self, *args, etag=None, **kwargs):
+        """
+        Returns a `(data, etag)` tuple. If `etag` is set, the request is
+        conditional and `data` is None if the resource was not modified.
+        """
+
+        headers = {}
+
+        if etag:
+            headers["If-None-Match"] = etag
+
+        response = self.request(*args, headers=headers, **kwargs)
+
+        if response.status_code == 304:
+            return None, etag
+
+        return self._decode_json(response), response.headers.get("ETag")
+
+    async def _run_in_executor(self, function, *args, **kwargs):
+        # `requests` has no asyncio support, so the blocking call is run in
+        # the default executor. This allows callers to await many requests
+        # concurrently using `asyncio.gather()`.
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            None,
+            functools.partial(function, *args, **kwargs),
+        )
+
+    async def aget_json(self, *args, **kwargs):
+        return await self._run_in_executor(self.get_json, *args, **kwargs)
+
+    async def aget_json_with_etag(self, *args, **kwargs):
+        return await self._run_in_executor(
+            self.get_json_with_etag,
+            *args,
+            **kwargs,
+        )
 
     def get_access_token_url(self):
         return self.get_control_panel_url(path=ACCESS_TOKEN_URL_PATH)
@@ -124,6 +192,14 @@ class Client:
 
         session.trust_env = False
 
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=Retry(total=HTTP_MAX_RETRIES, backoff_factor=0.2),
+        )
+
+        session.mount("https://", adapter)
+
         return session
 
     def retrieve_user_info(self):
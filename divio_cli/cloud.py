@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import os
@@ -49,8 +50,15 @@ def get_divio_zone():
 
 
 def get_endpoint(zone=None):
+    # the zone itself can't be cached, it depends on the environment and
+    # on the application the CLI is run in
     if not zone:
         zone = get_divio_zone()
+    return _get_endpoint_for_zone(zone)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_endpoint_for_zone(zone):
     if re.match("^https?://", zone):
         endpoint = zone
     else:
@@ -61,6 +69,10 @@ def get_endpoint(zone=None):
     return endpoint
 
 
+def find_environment(environments, slug):
+    return next((env for env in environments if env["slug"] == slug), None)
+
+
 def get_service_color(service):
     color_mapping = {
         "web": "blue",
@@ -75,10 +87,10 @@ def get_service_color(service):
 
 
 class CloudClient:
-    def __init__(self, endpoint, debug=False, sudo=False):
+    def __init__(self, endpoint, debug=False, sudo=False, config=None):
         self.debug = debug
         self.sudo = sudo
-        self.config = Config()
+        self.config = config or Config()
         self.endpoint = endpoint
         self.netrc = WritableNetRC()
         self.session = self.init_session()
@@ -789,27 +801,22 @@ class CloudClient:
 
         # Retrieve environment data if environment is provided.
         if not all_environments:
-            env_found = False
-            for retrieved_env in environment_response:
-                if retrieved_env["slug"] == environment:
-                    params.update({"environment": retrieved_env["uuid"]})
-                    env_found = True
-                    break
-
-            if not env_found:
+            env = find_environment(environment_response, environment)
+
+            if env is None:
                 click.secho(
                     f"Environment with the name {environment!r} does not exist.",
                     fg="red",
                     err=True,
                 )
-            try:
-                env = self.get_environment_by_application(
-                    application_uuid, environment
-                )
+                try:
+                    env = self.get_environment_by_application(
+                        application_uuid, environment
+                    )
+                except KeyError:
+                    raise EnvironmentDoesNotExist(environment)
 
-                params.update({"environment": env["uuid"]})
-            except KeyError:
-                raise EnvironmentDoesNotExist(environment)
+            params.update({"environment": env["uuid"]})
 
         try:
             results, messages = json_response_request_paginate(
@@ -954,15 +961,10 @@ class CloudClient:
         if all_environments:
             params = {"application": application_uuid}
         else:
-            params = {}
-            env_found = False
-            for retrieved_env in environment_response:
-                if retrieved_env["slug"] == environment:
-                    params.update({"environment": retrieved_env["uuid"]})
-                    env_found = True
-                    break
-            if not env_found:
+            env = find_environment(environment_response, environment)
+            if env is None:
                 raise EnvironmentDoesNotExist(environment)
+            params = {"environment": env["uuid"]}
 
         if variable_name:
             params.update({"name": variable_name})
@@ -1,6 +1,11 @@
+import atexit
+import contextlib
 import errno
 import json
 import os
+import stat
+import tempfile
+import threading
 import time
 from netrc import netrc
 
@@ -11,6 +16,14 @@ from divio_cli.exceptions import DivioException
 from . import __version__, settings, utils
 
 
+UPDATE_CHECK_INTERVAL = 60 * 60 * 24
+UPDATE_CHECK_INTERVAL_ENV_VAR = "DIVIO_UPDATE_CHECK_INTERVAL"
+UPDATE_CHECK_JOIN_TIMEOUT = 1
+UPDATE_CHECK_TIMESTAMP_KEY = "update_check_timestamp"
+UPDATE_CHECK_VERSION_KEY = "update_check_version"
+UPDATE_CHECK_PYPI_CACHE_KEY = "update_check_pypi_cache"
+
+
 def get_global_config_path():
     old_path = os.path.join(os.path.expanduser("~"), settings.ALDRYN_DOT_FILE)
     if os.path.exists(old_path):
@@ -19,12 +32,27 @@ def get_global_config_path():
         return settings.DIVIO_GLOBAL_CONFIG_FILE
 
 
+def get_file_mode(path):
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        # the umask can only be read by setting it
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
 class Config:
     config = {}
 
     def __init__(self):
         super().__init__()
         self.config_path = get_global_config_path()
+
+        # the update check modifies and saves the config from a
+        # background thread
+        self._lock = threading.RLock()
+
         self.read()
 
     def read(self):
@@ -40,50 +68,79 @@ class Config:
         self.config = config
 
     def save(self):
+        config_dir = os.path.dirname(self.config_path)
+
         # Create folders if they don't exist yet.
-        if not os.path.exists(os.path.dirname(self.config_path)):
+        if not os.path.exists(config_dir):
             try:
-                os.makedirs(os.path.dirname(self.config_path))
+                os.makedirs(config_dir)
             except OSError as exc:  # Guard against race condition
                 if exc.errno != errno.EEXIST:
                     raise
 
-        with open(self.config_path, "w+") as fh:
-            json.dump(self.config, fh)
+        # The config may be saved from a background thread (update check)
+        # which can be killed at any time, so the file is replaced
+        # atomically to never leave a partially written config behind.
+        fd, tmp_path = tempfile.mkstemp(dir=config_dir)
+        try:
+            with self._lock, os.fdopen(fd, "w") as fh:
+                json.dump(self.config, fh)
+
+            # mkstemp creates the file with mode 0600, keep the mode of
+            # the existing config, or the default mode for a new one
+            os.chmod(tmp_path, get_file_mode(self.config_path))
+            os.replace(tmp_path, self.config_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+
+    def is_update_check_disabled(self):
+        return self.config.get("disable_update_check", False)
+
+    def get_update_check_interval(self):
+        """seconds between two checks, see DIVIO_UPDATE_CHECK_INTERVAL"""
+        try:
+            return int(os.environ[UPDATE_CHECK_INTERVAL_ENV_VAR])
+        except (KeyError, ValueError):
+            return UPDATE_CHECK_INTERVAL
 
-    def check_for_updates(self, force=False):
-        """check for updates daily"""
-        if self.config.get("disable_update_check", False) and not force:
-            return None
+    def is_update_check_due(self):
+        last_checked = self.config.get(UPDATE_CHECK_TIMESTAMP_KEY, None)
 
-        timestamp_key = "update_check_timestamp"
-        version_key = "update_check_version"
+        return not last_checked or last_checked < int(time.time()) - (
+            self.get_update_check_interval()
+        )
 
-        last_checked = self.config.get(timestamp_key, None)
-        now = int(time.time())
-        installed_version = version.parse(__version__)
-        pypi_error = None
+    def has_update_check_result(self):
+        return UPDATE_CHECK_TIMESTAMP_KEY in self.config
 
-        if force or not last_checked or last_checked < now - (60 * 60 * 24):
-            # try to access PyPI to get the latest available version
-            remote_version, pypi_error = utils.get_latest_version_from_pypi()
-
-            if remote_version:
-                if remote_version > installed_version:
-                    self.config[version_key] = str(remote_version)
-                self.config[timestamp_key] = now
-                self.save()
-            elif remote_version is False:
-                # fail silently, nothing the user can do about this
-                self.config.pop(version_key, None)
-
-        newest_version_s = self.config.get(version_key, None)
+    def check_for_updates_in_background(self, force=False):
+        """check for updates without waiting for PyPI"""
+        thread = threading.Thread(
+            target=self.check_for_updates,
+            kwargs={"force": force},
+            daemon=True,
+        )
+        thread.start()
+
+        # short commands are done before PyPI answers, so the check gets
+        # a moment to finish before the interpreter kills it
+        atexit.register(thread.join, timeout=UPDATE_CHECK_JOIN_TIMEOUT)
+
+        return thread
+
+    def get_update_info(self, pypi_error=None):
+        """return the result of the last update check without checking"""
+        installed_version = version.parse(__version__)
         newest_version = None
-        if newest_version_s:
-            newest_version = version.parse(newest_version_s)
-            if newest_version <= installed_version:
-                self.config.pop(version_key)
-                self.save()
+        with self._lock:
+            newest_version_s = self.config.get(UPDATE_CHECK_VERSION_KEY, None)
+            if newest_version_s:
+                newest_version = version.parse(newest_version_s)
+                if newest_version <= installed_version:
+                    self.config.pop(UPDATE_CHECK_VERSION_KEY, None)
+                    self.save()
         return {
             "current": __version__,
             "remote": str(newest_version),
@@ -93,6 +150,38 @@ class Config:
             "pypi_error": pypi_error,
         }
 
+    def check_for_updates(self, force=False):
+        """check for updates daily"""
+        if self.is_update_check_disabled() and not force:
+            return None
+
+        now = int(time.time())
+        installed_version = version.parse(__version__)
+        pypi_error = None
+
+        if force or self.is_update_check_due():
+            # try to access PyPI to get the latest available version
+            remote_version, pypi_error, pypi_cache = (
+                utils.get_latest_version_from_pypi(
+                    cache=self.config.get(UPDATE_CHECK_PYPI_CACHE_KEY),
+                )
+            )
+
+            with self._lock:
+                if remote_version:
+                    self.config[UPDATE_CHECK_PYPI_CACHE_KEY] = pypi_cache
+                    if remote_version > installed_version:
+                        self.config[UPDATE_CHECK_VERSION_KEY] = str(
+                            remote_version
+                        )
+                    self.config[UPDATE_CHECK_TIMESTAMP_KEY] = now
+                    self.save()
+                elif remote_version is False:
+                    # fail silently, nothing the user can do about this
+                    self.config.pop(UPDATE_CHECK_VERSION_KEY, None)
+
+        return self.get_update_info(pypi_error=pypi_error)
+
     def skip_doctor(self):
         return self.config.get("skip_doctor")
 
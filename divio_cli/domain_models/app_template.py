@@ -1,53 +1,259 @@
+import functools
+import math
+import threading
+from collections import OrderedDict
+
 from divio_cli.exceptions import DivioException
 
 
+class LRUCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+
+            self._data.move_to_end(key)
+
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def remove(self, predicate=None):
+        with self._lock:
+            if predicate is None:
+                self._data.clear()
+
+                return
+
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+
+@functools.lru_cache(maxsize=1024)
+def format_url_path(url_path, **kwargs):
+    return url_path.format(**kwargs)
+
+
 class AppTemplate:
+    __slots__ = ("client", "uuid", "_data")
+
     LIST_APP_TEMPLATES_URL_PATH = "/apps/v3/app-templates/"
     GET_APP_TEMPLATE_URL_PATH = "/apps/v3/app-templates/{uuid}"
 
+    MAX_CONCURRENT_REQUESTS = 8
+
+    # app templates don't change during a CLI run, so their API responses
+    # are shared between all instances
+    _cache = LRUCache(maxsize=512)
+
     class DoesNotExistError(DivioException):
         pass
 
+    @classmethod
+    def _get_page(cls, client, page_size=None, page=None):
+        params = {
+            key: value
+            for key, value in (("page_size", page_size), ("page", page))
+            if value is not None
+        }
+
+        return client.get_json(
+            path=cls.LIST_APP_TEMPLATES_URL_PATH,
+            method="GET",
+            params=params,
+        )
+
+    @classmethod
+    def _from_results(cls, client, results):
+        return [
+            cls(
+                client=client,
+                uuid=result["uuid"],
+                data=result,
+                refresh=False,
+            )
+            for result in results
+        ]
+
     @classmethod
     def list(cls, client, page_size=None, page=None):
-        app_templates = []
-        params = {}
+        app_templates_data = cls._get_page(
+            client=client,
+            page_size=page_size,
+            page=page,
+        )
 
-        if page_size is not None:
-            params["page_size"] = page_size
+        return cls._from_results(
+            client=client,
+            results=app_templates_data["results"],
+        )
+
+    @classmethod
+    def list_all(cls, client, page_size=100):
+        # the first page tells us how many pages there are, so all
+        # remaining pages can be requested in parallel
+        app_templates_data = cls._get_page(
+            client=client,
+            page_size=page_size,
+            page=1,
+        )
+
+        results = list(app_templates_data["results"])
+
+        if app_templates_data["next"] and results:
+            from concurrent.futures import ThreadPoolExecutor
+
+            # the API may cap the page size, so the size of the first page
+            # is used to calculate the page count
+            page_count = math.ceil(app_templates_data["count"] / len(results))
 
-        if page is not None:
-            params["page"] = page
+            def get_page(page):
+                return cls._get_page(
+                    client=client,
+                    page_size=page_size,
+                    page=page,
+                )
+
+            with ThreadPoolExecutor(
+                max_workers=min(cls.MAX_CONCURRENT_REQUESTS, page_count - 1),
+            ) as executor:
+                for page_data in executor.map(
+                    get_page,
+                    range(2, page_count + 1),
+                ):
+                    results.extend(page_data["results"])
+
+        return cls._from_results(client=client, results=results)
+
+    @classmethod
+    def iter_all(cls, client, page_size=100):
+        """
+        Yields all app templates by following the `next` links of the API,
+        fetching one page at a time.
+        """
+
+        path = cls.LIST_APP_TEMPLATES_URL_PATH
+        params = {"page_size": page_size}
+
+        while path:
+            app_templates_data = client.get_json(
+                path=path,
+                method="GET",
+                params=params,
+            )
+
+            yield from cls._from_results(
+                client=client,
+                results=app_templates_data["results"],
+            )
+
+            # the next link already contains all query parameters
+            path = app_templates_data["next"]
+            params = None
+
+    @classmethod
+    def retrieve(cls, client, uuid):
+        return AppTemplate(client=client, uuid=uuid, refresh=True)
+
+    @classmethod
+    async def aretrieve(cls, client, uuid):
+        app_template = cls(client=client, uuid=uuid, refresh=False)
+
+        await app_template.arefresh(use_cache=True)
+
+        return app_template
+
+    @classmethod
+    async def aretrieve_many(cls, client, uuids, max_concurrency=None):
+        import asyncio
+
+        semaphore = asyncio.Semaphore(
+            max_concurrency or cls.MAX_CONCURRENT_REQUESTS,
+        )
+
+        async def aretrieve(uuid):
+            async with semaphore:
+                return await cls.aretrieve(client=client, uuid=uuid)
+
+        return await asyncio.gather(*[aretrieve(uuid) for uuid in uuids])
+
+    @classmethod
+    def retrieve_many(cls, client, uuids, max_concurrency=None):
+        """
+        Retrieves multiple app templates using a single API request.
+
+        App templates that are not part of the response, because the API
+        ignored the UUID filter, are retrieved concurrently one by one.
+        """
+
+        uuids = list(uuids)
+        app_templates = {}
+
+        if not uuids:
+            return []
 
         app_templates_data = client.get_json(
             path=cls.LIST_APP_TEMPLATES_URL_PATH,
             method="GET",
-            params=params,
+            params={
+                "uuid__in": ",".join(uuids),
+                "page_size": len(uuids),
+            },
         )
 
+        wanted_uuids = set(uuids)
+
         for result in app_templates_data["results"]:
-            app_templates.append(
-                AppTemplate(
-                    client=client,
-                    uuid=result["uuid"],
-                    data=result,
-                    refresh=False,
-                ),
+            if result["uuid"] not in wanted_uuids:
+                continue
+
+            cls._cache.set(
+                cls._get_cache_key(client=client, uuid=result["uuid"]),
+                (None, result),
             )
 
-        return app_templates
+            app_templates[result["uuid"]] = cls(
+                client=client,
+                uuid=result["uuid"],
+                data=result,
+                refresh=False,
+            )
 
-    @classmethod
-    def retrieve(cls, client, uuid):
-        return AppTemplate(client=client, uuid=uuid)
+        missing_uuids = [uuid for uuid in uuids if uuid not in app_templates]
 
-    def __init__(self, client, uuid, data=None, refresh=True):
+        if missing_uuids:
+            import asyncio
+
+            for app_template in asyncio.run(
+                cls.aretrieve_many(
+                    client=client,
+                    uuids=missing_uuids,
+                    max_concurrency=max_concurrency,
+                ),
+            ):
+                app_templates[app_template.uuid] = app_template
+
+        return [app_templates[uuid] for uuid in uuids]
+
+    def __init__(self, client, uuid, data=None, refresh=False):
         self.client = client
         self.uuid = uuid
-        self.data = data or {}
+        self._data = data
 
         if refresh:
-            self.refresh()
+            self.refresh(use_cache=True)
 
     def __repr__(self):
         module_name = self.__class__.__module__
@@ -55,17 +261,95 @@ class AppTemplate:
 
         return f"<{module_name}.{class_name}(client={self.client!r}, uuid={self.uuid!r})>"
 
-    def refresh(self):
+    def get_url_path(self):
+        return format_url_path(self.GET_APP_TEMPLATE_URL_PATH, uuid=self.uuid)
+
+    @property
+    def data(self):
+        # the app template is only fetched when its data is actually needed
+        if self._data is None:
+            self.refresh(use_cache=True)
+
+        return self._data
+
+    @classmethod
+    def _get_cache_key(cls, client, uuid):
+        return (client.zone, client.token, uuid)
+
+    @classmethod
+    def invalidate(cls, uuid=None):
+        """
+        Drops cached API responses for the app template with the given UUID,
+        or for all app templates if no UUID is given.
+        """
+
+        if uuid is None:
+            cls._cache.remove()
+
+        else:
+            cls._cache.remove(lambda key: key[-1] == uuid)
+
+    def _get_cache_entry(self):
+        # cache entries are (etag, app_template_data) tuples
+        return self._cache.get(
+            self._get_cache_key(client=self.client, uuid=self.uuid),
+            (None, None),
+        )
+
+    def _update_data(self, etag, app_template_data, cached_app_template_data):
+        # the API responds with 304 Not Modified and no data when the
+        # app template didn't change since it was cached
+        if app_template_data is None:
+            app_template_data = cached_app_template_data
+
+        else:
+            self._cache.set(
+                self._get_cache_key(client=self.client, uuid=self.uuid),
+                (etag, app_template_data),
+            )
+
+        self._data = dict(app_template_data)
+
+    def refresh(self, use_cache=False):
+        etag, cached_app_template_data = self._get_cache_entry()
+
+        if use_cache and cached_app_template_data is not None:
+            self._data = dict(cached_app_template_data)
+
+            return
+
         try:
-            app_template_data = self.client.get_json(
-                path=self.GET_APP_TEMPLATE_URL_PATH.format(uuid=self.uuid),
+            app_template_data, etag = self.client.get_json_with_etag(
+                path=self.get_url_path(),
                 method="GET",
+                etag=etag,
             )
 
-            self.data.clear()
-            self.data.update(app_template_data)
+        except DivioException as original_exception:
+            raise self.DoesNotExistError(
+                f"No app template with UUID {self.uuid} found",
+            ) from original_exception
+
+        self._update_data(etag, app_template_data, cached_app_template_data)
+
+    async def arefresh(self, use_cache=False):
+        etag, cached_app_template_data = self._get_cache_entry()
+
+        if use_cache and cached_app_template_data is not None:
+            self._data = dict(cached_app_template_data)
+
+            return
+
+        try:
+            app_template_data, etag = await self.client.aget_json_with_etag(
+                path=self.get_url_path(),
+                method="GET",
+                etag=etag,
+            )
 
         except DivioException as original_exception:
             raise self.DoesNotExistError(
                 f"No app template with UUID {self.uuid} found",
             ) from original_exception
+
+        self._update_data(etag, app_template_data, cached_app_template_data)
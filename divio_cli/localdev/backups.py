@@ -6,10 +6,6 @@ import time
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 
-import boto3
-
-from azure.storage.blob import BlobClient
-
 import requests
 
 from divio_cli.exceptions import DivioException
@@ -133,6 +129,9 @@ def upload_backup(
 
 
 def _upload_backup_aws(upload_params, local_file):
+    # boto3 and the azure sdk are slow to import and only needed for uploads
+    import boto3
+
     boto3.client(
         "s3",
         aws_access_key_id=upload_params["aws_access_key_id"],
@@ -146,6 +145,8 @@ def _upload_backup_aws(upload_params, local_file):
 
 
 def _upload_backup_azure(upload_params, local_file):
+    from azure.storage.blob import BlobClient
+
     with open(local_file, "rb") as fh:
         BlobClient.from_blob_url(blob_url=upload_params["url"]).upload_blob(
             fh, overwrite=True, max_concurrency=10
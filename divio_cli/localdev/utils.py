@@ -62,10 +62,13 @@ def get_project_settings(path=None, silent=False):
         raise DivioException(f"Unexpected value in {path}")
 
 
-def migrate_project_settings(client):
+def migrate_project_settings(get_client):
     """
     Migrates old versions of `.divio/config.json` to the current format.
 
+    `get_client` is a callable returning a `CloudClient`. It is only called
+    if a migration needs the API.
+
     Migrations:
         - legacy project-id (`id`) to application UUID (`application_uuid`)
 
@@ -94,6 +97,7 @@ def migrate_project_settings(client):
         else:
             # convert legacy project id to application UUID
             with contextlib.suppress(Exception):
+                client = get_client()
                 settings["application_uuid"] = client.get_application_uuid(
                     application_uuid_or_remote_id=settings["id"],
                 )
@@ -286,7 +290,7 @@ class DockerComposeConfig:
         return self.config.get("services", {})
 
     def has_service(self, service):
-        return service in self.get_services().keys()
+        return service in self.get_services()
 
     def has_volume_mount(self, service, remote_path):
         """
@@ -0,0 +1,203 @@
+import asyncio
+from urllib.parse import parse_qsl
+
+import pytest
+
+from divio_cli.client import ApiError
+from divio_cli.domain_models.app_template import AppTemplate
+
+
+class FakeClient:
+    zone = "divio.com"
+    token = "token"
+
+    def __init__(self, app_templates, supports_uuid_filter=False):
+        self.app_templates = {
+            app_template["uuid"]: app_template
+            for app_template in app_templates
+        }
+
+        self.supports_uuid_filter = supports_uuid_filter
+
+        self.requests = []
+        self.not_modified_responses = 0
+
+    def get_json(self, path, method="GET", params=None):
+        self.requests.append((path, params))
+
+        if path.startswith(f"{AppTemplate.LIST_APP_TEMPLATES_URL_PATH}?"):
+            path, query = path.split("?")
+            params = {
+                **(params or {}),
+                **{k: int(v) for k, v in parse_qsl(query)},
+            }
+
+        if path == AppTemplate.LIST_APP_TEMPLATES_URL_PATH:
+            params = params or {}
+            results = list(self.app_templates.values())
+
+            if self.supports_uuid_filter and "uuid__in" in params:
+                uuids = params["uuid__in"].split(",")
+                results = [r for r in results if r["uuid"] in uuids]
+
+            page_size = params.get("page_size", len(results))
+            page = params.get("page", 1)
+            start = (page - 1) * page_size
+            end = start + page_size
+            next_page = None
+
+            if end < len(results):
+                next_page = f"{path}?page={page + 1}&page_size={page_size}"
+
+            return {
+                "count": len(results),
+                "next": next_page,
+                "previous": None,
+                "results": results[start:end],
+            }
+
+        uuid = path.rsplit("/", 1)[-1]
+
+        if uuid not in self.app_templates:
+            raise ApiError(status_code=404)
+
+        return dict(self.app_templates[uuid])
+
+    def get_json_with_etag(self, *args, etag=None, **kwargs):
+        data = self.get_json(*args, **kwargs)
+        new_etag = f'"{data["name"]}"'
+
+        if etag == new_etag:
+            self.not_modified_responses += 1
+
+            return None, etag
+
+        return data, new_etag
+
+    async def aget_json_with_etag(self, *args, **kwargs):
+        return self.get_json_with_etag(*args, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def _clear_app_template_cache():
+    AppTemplate.invalidate()
+
+
+@pytest.fixture
+def client():
+    return FakeClient(
+        app_templates=[
+            {"uuid": "1", "name": "Django"},
+            {"uuid": "2", "name": "Flask"},
+            {"uuid": "3", "name": "FastAPI"},
+        ],
+    )
+
+
+def test_retrieve(client):
+    app_template = AppTemplate.retrieve(client=client, uuid="2")
+
+    assert app_template.data["name"] == "Flask"
+
+
+def test_retrieve_does_not_exist(client):
+    with pytest.raises(AppTemplate.DoesNotExistError):
+        AppTemplate.retrieve(client=client, uuid="4")
+
+
+def test_aretrieve(client):
+    app_template = asyncio.run(AppTemplate.aretrieve(client=client, uuid="3"))
+
+    assert app_template.data["name"] == "FastAPI"
+
+
+def test_retrieve_many(client):
+    app_templates = AppTemplate.retrieve_many(
+        client=client,
+        uuids=["3", "1"],
+        max_concurrency=1,
+    )
+
+    assert [t.data["name"] for t in app_templates] == ["FastAPI", "Django"]
+
+    # the client ignores the UUID filter, so "3" had to be fetched separately
+    assert len(client.requests) == 2
+
+
+def test_retrieve_many_single_request(client):
+    client.supports_uuid_filter = True
+
+    app_templates = AppTemplate.retrieve_many(
+        client=client,
+        uuids=["3", "1"],
+    )
+
+    assert [t.data["name"] for t in app_templates] == ["FastAPI", "Django"]
+    assert len(client.requests) == 1
+
+    with pytest.raises(AppTemplate.DoesNotExistError):
+        AppTemplate.retrieve_many(client=client, uuids=["1", "4"])
+
+
+def test_list(client):
+    app_templates = AppTemplate.list(client=client, page_size=2, page=2)
+
+    assert [t.uuid for t in app_templates] == ["3"]
+
+
+def test_list_all(client):
+    app_templates = AppTemplate.list_all(client=client, page_size=2)
+
+    assert [t.uuid for t in app_templates] == ["1", "2", "3"]
+    assert len(client.requests) == 2
+
+
+def test_iter_all(client):
+    app_templates = AppTemplate.iter_all(client=client, page_size=2)
+
+    assert [t.uuid for t in app_templates] == ["1", "2", "3"]
+    assert len(client.requests) == 2
+
+
+def test_data_is_fetched_lazily(client):
+    app_template = AppTemplate(client=client, uuid="2")
+
+    assert not client.requests
+
+    assert app_template.data["name"] == "Flask"
+    assert app_template.data["name"] == "Flask"
+    assert len(client.requests) == 1
+
+
+def test_retrieve_uses_cache(client):
+    AppTemplate.retrieve(client=client, uuid="1")
+    AppTemplate.retrieve(client=client, uuid="1")
+
+    assert len(client.requests) == 1
+
+    # refresh always hits the API
+    app_template = AppTemplate.retrieve(client=client, uuid="1")
+    client.app_templates["1"]["name"] = "Django CMS"
+    app_template.refresh()
+
+    assert app_template.data["name"] == "Django CMS"
+    assert len(client.requests) == 2
+
+    AppTemplate.invalidate(uuid="1")
+    AppTemplate.retrieve(client=client, uuid="1")
+
+    assert len(client.requests) == 3
+
+
+def test_refresh_uses_etag(client):
+    app_template = AppTemplate.retrieve(client=client, uuid="1")
+    app_template.refresh()
+
+    assert app_template.data["name"] == "Django"
+    assert client.not_modified_responses == 1
+
+    client.app_templates["1"]["name"] = "Django CMS"
+    app_template.refresh()
+
+    assert app_template.data["name"] == "Django CMS"
+    assert client.not_modified_responses == 1
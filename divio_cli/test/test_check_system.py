@@ -0,0 +1,66 @@
+import subprocess
+import threading
+from collections import OrderedDict
+from unittest.mock import patch
+
+# divio_cli.cloud, which check_system depends on, can only be imported
+# once the localdev package is loaded
+import divio_cli.localdev  # noqa: F401
+from divio_cli import check_system
+
+
+def test_check_requirements_runs_checks_concurrently(monkeypatch):
+    last_check_done = threading.Event()
+
+    class SlowCheck(check_system.Check):
+        name = "Slow"
+
+        def run_check(self):
+            # only finishes if the last check runs at the same time
+            if not last_check_done.wait(timeout=5):
+                return ["checks did not run concurrently"]
+            return []
+
+    class FastCheck(check_system.Check):
+        name = "Fast"
+
+        def run_check(self):
+            return []
+
+    class LastCheck(check_system.Check):
+        name = "Last"
+
+        def run_check(self):
+            last_check_done.set()
+            return ["failed"]
+
+    monkeypatch.setattr(
+        check_system,
+        "ALL_CHECKS",
+        OrderedDict(
+            [("slow", SlowCheck), ("fast", FastCheck), ("last", LastCheck)]
+        ),
+    )
+
+    results = list(
+        check_system.check_requirements(checks=["slow", "fast", "last"])
+    )
+
+    # results keep the requested order, not the order of completion
+    assert results == [
+        ("slow", "Slow", []),
+        ("fast", "Fast", []),
+        ("last", "Last", ["failed"]),
+    ]
+
+
+@patch("divio_cli.check_system.utils.check_call")
+def test_check_timeout(check_call):
+    check_call.side_effect = subprocess.TimeoutExpired(
+        cmd=("git", "--version"), timeout=120
+    )
+
+    errors = check_system.GitCheck().run_check()
+
+    assert errors == ["Command 'git --version' timed out after 120 seconds"]
+    assert check_call.call_args.kwargs["timeout"] == 120
@@ -0,0 +1,97 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from divio_cli import config as config_module
+from divio_cli.config import (
+    UPDATE_CHECK_INTERVAL,
+    UPDATE_CHECK_INTERVAL_ENV_VAR,
+    UPDATE_CHECK_JOIN_TIMEOUT,
+    UPDATE_CHECK_TIMESTAMP_KEY,
+    Config,
+)
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        config_module,
+        "get_global_config_path",
+        lambda: str(tmp_path / "config.json"),
+    )
+    monkeypatch.delenv(UPDATE_CHECK_INTERVAL_ENV_VAR, raising=False)
+    return Config()
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, UPDATE_CHECK_INTERVAL),
+        ("60", 60),
+        ("daily", UPDATE_CHECK_INTERVAL),
+    ],
+)
+def test_get_update_check_interval(config, monkeypatch, value, expected):
+    if value is not None:
+        monkeypatch.setenv(UPDATE_CHECK_INTERVAL_ENV_VAR, value)
+
+    assert config.get_update_check_interval() == expected
+
+
+def test_is_update_check_due(config, monkeypatch):
+    assert config.is_update_check_due()
+
+    config.config[UPDATE_CHECK_TIMESTAMP_KEY] = int(time.time()) - 120
+    assert not config.is_update_check_due()
+
+    monkeypatch.setenv(UPDATE_CHECK_INTERVAL_ENV_VAR, "60")
+    assert config.is_update_check_due()
+
+
+def test_has_update_check_result(config):
+    assert not config.has_update_check_result()
+
+    config.config[UPDATE_CHECK_TIMESTAMP_KEY] = int(time.time())
+    assert config.has_update_check_result()
+
+
+@patch("divio_cli.config.atexit.register")
+@patch("divio_cli.utils.requests.get")
+def test_check_for_updates_in_background(get, register, config):
+    get.return_value = Mock(
+        status_code=200,
+        headers={},
+        **{"json.return_value": {"info": {"version": "999.0"}}},
+    )
+
+    thread = config.check_for_updates_in_background(force=True)
+    thread.join()
+
+    # the thread is given a moment to finish when the CLI exits
+    register.assert_called_once_with(
+        thread.join, timeout=UPDATE_CHECK_JOIN_TIMEOUT
+    )
+    assert config.has_update_check_result()
+    assert config.get_update_info()["remote"] == "999.0"
+
+
+@patch("divio_cli.utils.requests.get")
+def test_check_for_updates_uses_conditional_get(get, config):
+    get.return_value = Mock(
+        status_code=200,
+        headers={"ETag": '"abc"'},
+        **{"json.return_value": {"info": {"version": "999.0"}}},
+    )
+
+    assert config.check_for_updates(force=True)["remote"] == "999.0"
+    assert get.call_args.kwargs["headers"] == {}
+
+    get.return_value = Mock(status_code=304, headers={})
+
+    # the result of the 304 response comes from the stored validators
+    update_info = Config().check_for_updates(force=True)
+
+    assert get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+    assert update_info["remote"] == "999.0"
+    assert update_info["update_available"]
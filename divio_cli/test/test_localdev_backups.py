@@ -1,3 +1,4 @@
+import sys
 from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, Mock, mock_open, patch
 
@@ -183,7 +184,7 @@ def test_upload_backup_wrong_handler():
 
 def test__upload_backup_aws(monkeypatch):
     boto3 = MagicMock()
-    monkeypatch.setattr("divio_cli.localdev.backups.boto3", boto3)
+    monkeypatch.setitem(sys.modules, "boto3", boto3)
 
     backups._upload_backup_aws(AWS_PARAMS["upload_parameters"], "file")
     boto3.client.assert_called_with(
@@ -199,7 +200,7 @@ def test__upload_backup_aws(monkeypatch):
 
 def test__upload_backup_azure(monkeypatch):
     BlobClient = MagicMock()
-    monkeypatch.setattr("divio_cli.localdev.backups.BlobClient", BlobClient)
+    monkeypatch.setattr("azure.storage.blob.BlobClient", BlobClient)
 
     with patch("builtins.open", mock_open()) as mock_file:
         backups._upload_backup_azure(AZURE_PARAMS["upload_parameters"], "file")
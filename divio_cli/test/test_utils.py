@@ -0,0 +1,81 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from packaging import version
+
+from divio_cli import utils
+
+
+def _pypi_response(status_code=200, headers=None, latest_version="3.0.0"):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = {"info": {"version": latest_version}}
+    return response
+
+
+@patch("divio_cli.utils.requests.get")
+def test_get_latest_version_from_pypi(get):
+    get.return_value = _pypi_response(
+        headers={"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024"},
+    )
+
+    newest_version, error, cache = utils.get_latest_version_from_pypi()
+
+    assert newest_version == version.parse("3.0.0")
+    assert error is None
+    assert cache == {
+        "etag": '"abc"',
+        "last_modified": "Mon, 01 Jan 2024",
+        "version": "3.0.0",
+    }
+    # nothing to validate against yet, so the request is unconditional
+    assert get.call_args.kwargs["headers"] == {}
+
+
+@patch("divio_cli.utils.requests.get")
+def test_get_latest_version_from_pypi_not_modified(get):
+    get.return_value = _pypi_response(status_code=304)
+    cached = {
+        "etag": '"abc"',
+        "last_modified": "Mon, 01 Jan 2024",
+        "version": "2.0.0",
+    }
+
+    newest_version, error, cache = utils.get_latest_version_from_pypi(
+        cache=cached
+    )
+
+    assert get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024",
+    }
+    # the body of a 304 response is never read
+    assert not get.return_value.json.called
+    assert newest_version == version.parse("2.0.0")
+    assert error is None
+    # the validators are carried forward if the 304 doesn't repeat them
+    assert cache == cached
+
+
+@patch("divio_cli.utils.requests.get")
+def test_get_latest_version_from_pypi_error(get):
+    exc = requests.ConnectionError("offline")
+    get.side_effect = exc
+
+    assert utils.get_latest_version_from_pypi() == (False, exc, None)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"indent": 2}, {"indent": 2, "sort_keys": True}]
+)
+def test_json_dumps_does_not_depend_on_orjson(monkeypatch, kwargs):
+    pytest.importorskip("orjson")
+
+    content = {"y": ["ü", 1, None], "x": {"nested": True}}
+    with_orjson = utils.json_dumps(content, **kwargs)
+
+    monkeypatch.setattr(utils, "orjson", None)
+
+    assert utils.json_dumps(content, **kwargs) == with_orjson
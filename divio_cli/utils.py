@@ -1,3 +1,4 @@
+import functools
 import io
 import json
 import os
@@ -23,7 +24,15 @@ from divio_cli.exceptions import DivioException, EnvironmentDoesNotExist
 from . import __version__
 
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
 ALDRYN_DEFAULT_BRANCH_NAME = "develop"
+PYPI_TIMEOUT = 5
+ENVIRONMENT_TITLE = "Environment: {environment} ({environment_uuid})"
 
 
 def status_print(message, status="default", **kwargs):
@@ -57,6 +66,17 @@ def table(data, headers, **kwargs):
     return tabulate(data, headers, **kwargs)
 
 
+def table_many(tables, headers, **kwargs):
+    """
+    Renders a titled table for each `(title, rows)` pair of `tables`.
+    All tables share the same headers and format.
+    """
+
+    return "\n\n".join(
+        f"{title}\n{table(rows, headers, **kwargs)}" for title, rows in tables
+    )
+
+
 def get_package_version(path):
     return check_output(["python", "setup.py", "--version"], cwd=path).strip()
 
@@ -202,6 +222,25 @@ def is_windows():
     return sys.platform == "win32"
 
 
+@functools.lru_cache(maxsize=1)
+def get_executable_dir():
+    # resolving symlinks (e.g. pyenv shims) costs a stat call per path
+    # component, and the interpreter doesn't move while the CLI runs
+    return os.path.dirname(os.path.realpath(sys.executable))
+
+
+@functools.lru_cache(maxsize=1)
+def get_local_version_json():
+    """
+    Returns the version info of the installed CLI, without asking PyPI,
+    serialized as json.
+    """
+
+    return json_dumps(
+        {"current": __version__, "location": get_executable_dir()}
+    )
+
+
 unit_list = list(
     zip(["bytes", "kB", "MB", "GB", "TB", "PB"], [0, 0, 1, 2, 2, 2])
 )
@@ -244,16 +283,46 @@ def get_size(start_path):
     return total_size
 
 
-def get_latest_version_from_pypi():
+def get_latest_version_from_pypi(cache=None):
+    """
+    Returns the newest version on PyPI, the error which occurred while
+    asking PyPI, and the validators of the response.
+
+    When the validators of a previous response are passed as `cache`,
+    PyPI is asked conditionally and answers with 304 Not Modified and no
+    body if the package didn't change since.
+    """
+
+    cache = cache or {}
+    headers = {}
+    if cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if cache.get("last_modified"):
+        headers["If-Modified-Since"] = cache["last_modified"]
+
     try:
-        response = requests.get("https://pypi.python.org/pypi/divio-cli/json")
+        response = requests.get(
+            "https://pypi.python.org/pypi/divio-cli/json",
+            headers=headers,
+            timeout=PYPI_TIMEOUT,
+        )
         response.raise_for_status()
-        newest_version = version.parse(response.json()["info"]["version"])
-        return newest_version, None
+        if response.status_code == 304:
+            newest_version = version.parse(cache["version"])
+        else:
+            newest_version = version.parse(response.json()["info"]["version"])
+        cache = {
+            "etag": response.headers.get("ETag", cache.get("etag")),
+            "last_modified": response.headers.get(
+                "Last-Modified", cache.get("last_modified")
+            ),
+            "version": str(newest_version),
+        }
+        return newest_version, None, cache
     except requests.RequestException as exc:
-        return False, exc
+        return False, exc, None
     except (KeyError, ValueError):
-        return False, None
+        return False, None, None
 
 
 def get_git_commit():
@@ -331,40 +400,43 @@ def json_dumps_unicode(d, **kwargs):
     return json.dumps(d, ensure_ascii=False, **kwargs).encode("utf-8")
 
 
-class Map(dict):
+class ContextObject:
     """
-    A dictionary which also allows accessing values by dot notation.
-    Example:
-    m = Map({'first_name': 'Eduardo'}, last_name='Pool', age=24, sports=['Soccer'])
-    """
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for arg in args:
-            if isinstance(arg, dict):
-                for k, v in arg.iteritems():
-                    self[k] = v
+    The object passed to all CLI commands as `ctx.obj`.
 
-        if kwargs:
-            for k, v in kwargs.iteritems():
-                self[k] = v
-
-    def __getattr__(self, attr):
-        return self.get(attr)
+    Setting up the cloud client reads the config and netrc files, so it is
+    only created when a command accesses `client` for the first time.
+    Commands which only need the global config, like `version` and
+    `doctor`, should use `config` instead.
+    Attributes which were not set by a command group default to None.
+    """
 
-    def __setattr__(self, key, value):
-        self.__setitem__(key, value)
+    __slots__ = (
+        "_client",
+        "client_factory",
+        "config",
+        "client2",
+        "zone",
+        "pager",
+        "as_json",
+        "as_txt",
+        "interactive",
+        "verbose",
+        "metadata",
+    )
 
-    def __setitem__(self, key, value):
-        super().__setitem__(key, value)
-        self.__dict__.update({key: value})
+    def __init__(self, client_factory, config):
+        for attr in self.__slots__:
+            setattr(self, attr, None)
 
-    def __delattr__(self, item):
-        self.__delitem__(item)
+        self.client_factory = client_factory
+        self.config = config
 
-    def __delitem__(self, key):
-        super().__delitem__(key)
-        del self.__dict__[key]
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self.client_factory()
+        return self._client
 
 
 def split(delimiters, string, maxsplit=0):
@@ -399,6 +471,46 @@ def echo_large_content(content, ctx):
         click.echo(content)
 
 
+def get_json_kwargs(indent=None, sort_keys=False):
+    # makes the json module produce the same output as orjson, so the
+    # output doesn't depend on whether the speedups extra is installed
+    return {
+        "indent": indent,
+        "sort_keys": sort_keys,
+        "ensure_ascii": False,
+        "separators": (",", ": ") if indent is not None else (",", ":"),
+    }
+
+
+def json_dumps(content, indent=None, sort_keys=False):
+    # orjson only supports an indentation of two spaces
+    if orjson and indent in (None, 2):
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(content, option=option).decode()
+
+    return json.dumps(content, **get_json_kwargs(indent, sort_keys))
+
+
+def echo_large_json(content, ctx, indent=None, sort_keys=False):
+    if ctx.pager:
+        click.echo_via_pager(json_dumps(content, indent, sort_keys))
+    elif orjson:
+        click.echo(json_dumps(content, indent, sort_keys))
+    else:
+        # serialize straight into stdout instead of building the whole
+        # string in memory first
+        json.dump(
+            content,
+            click.get_text_stream("stdout"),
+            **get_json_kwargs(indent, sort_keys),
+        )
+        click.echo()
+
+
 def json_response_request_paginate(
     request, session, limit_results, params=None, url_kwargs=None
 ):
@@ -468,20 +580,22 @@ def clean_table_cell(d: dict, key: str):
 def echo_environment_variables_as_txt(
     results, ctx, all_environments, environment, variable_name=None
 ):
-    content = ""
+    content = io.StringIO()
     for result in results:
         result_content = []
         for row in result["environment_variables"]:
             if not row["is_sensitive"]:
                 result_content.append(f"{row['name']}={row['value']}\n")
         if result_content:
-            result_title = f"Environment: {result['environment']} ({result['environment_uuid']})"
+            result_title = ENVIRONMENT_TITLE.format_map(result)
             result_content.insert(
                 0, f"{result_title}\n{'-' * len(result_title)}\n"
             )
             result_content.append("\n\n")
 
-        content += "".join(result_content)
+        content.writelines(result_content)
+
+    content = content.getvalue()
 
     if content:
         echo_large_content(content.strip("\n"), ctx=ctx)
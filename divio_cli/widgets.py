@@ -428,9 +428,8 @@ def login(client, token=""):
     netrc = WritableNetRC()
 
     def validate_token(token):
-        distinct_characters = set(token)
-
-        if distinct_characters == {"\x16"}:
+        # the token consists of ^V (Ctrl+V) characters only
+        if token and not token.lstrip("\x16"):
             return "The access token provided indicates a copy/paste malfunction.\nRead more here: https://r.divio.com/divio-login-windows-users."
 
         client.authenticate(token=token)